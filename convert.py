@@ -7,15 +7,22 @@ Usage : python convert.py mon-document.md
 
 Dépendances :
   pip install markdown --break-system-packages
+  pip install orjson --break-system-packages   (optionnel)
 """
 
 import argparse
+import contextlib
 import glob
+import io
 import json
 import os
 import re
 import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
+from string import Template
 
 # ─── Dépendance : python-markdown ───────────────────────────────────────────
 try:
@@ -25,6 +32,12 @@ except ImportError:
     print("Installez-la avec : pip install markdown --break-system-packages")
     sys.exit(1)
 
+# ─── Dépendance optionnelle : orjson (lecture plus rapide de config.json) ───
+try:
+    from orjson import loads as _orjson_loads
+except ImportError:
+    _orjson_loads = None
+
 
 # ════════════════════════════════════════════════════════════════════════════
 # CONFIGURATION
@@ -47,12 +60,29 @@ DEFAULT_CONFIG = {
 }
 
 
+def _parse_json(data: bytes):
+    """
+    Analyse le JSON avec orjson s'il est installé, sinon avec json.
+    Ce qu'orjson refuse mais que json accepte (NaN, Infinity) repasse par json,
+    pour qu'un même config.json soit lu de la même façon sur toutes les machines.
+    """
+    if _orjson_loads is not None:
+        try:
+            return _orjson_loads(data)
+        except ValueError:
+            pass
+    return json.loads(data)
+
+
 def load_config(config_path: str) -> dict:
     """Charge config.json et fusionne avec les valeurs par défaut."""
     config = DEFAULT_CONFIG.copy()
     if config_path and os.path.exists(config_path):
-        with open(config_path, "r", encoding="utf-8") as f:
-            user_config = json.load(f)
+        data = Path(config_path).read_bytes()
+        # BOM retiré comme pour les sources : orjson le refuse, json l'accepte
+        if data.startswith(b"\xef\xbb\xbf"):
+            data = data[3:]
+        user_config = _parse_json(data)
         config.update(user_config)
         print(f"[config] Chargé depuis : {config_path}")
     else:
@@ -64,45 +94,76 @@ def load_config(config_path: str) -> dict:
 # FRONTMATTER YAML — strip silencieux, contenu ignoré
 # ════════════════════════════════════════════════════════════════════════════
 
-def strip_frontmatter(content: str) -> str:
+def strip_frontmatter(data: bytes) -> bytes:
     """
     Supprime le bloc frontmatter YAML s'il est présent (entre --- au début).
     Le contenu du frontmatter est ignoré : le nom du fichier fait office de titre.
+    Travaille sur les octets bruts, pour ne décoder ensuite que le corps.
     """
-    if not content.startswith("---"):
-        return content
-    end = content.find("\n---", 3)
+    if not data.startswith(b"---"):
+        return data
+    end = data.find(b"\n---", 3)
     if end == -1:
-        return content
-    return content[end + 4:].lstrip("\n")
+        return data
+    return data[end + 4:].lstrip(b"\n")
 
 
 # ════════════════════════════════════════════════════════════════════════════
 # PARSING DU DOCUMENT EN NŒUDS
 # ════════════════════════════════════════════════════════════════════════════
 
-def parse_sections(content: str) -> list:
+def _heading(line: str):
+    """
+    Reconnaît une ligne de titre ATX : 1 à 6 dièses, puis espaces/tabulations,
+    puis au moins un caractère. Renvoie (niveau, texte) ou None.
     """
+    rest = line.lstrip("#")
+    level = len(line) - len(rest)
+    if level > 6 or len(rest) < 2 or rest[0] not in " \t":
+        return None
+    return level, rest.strip()
+
+
+def parse_sections(content: str) -> list:
+    r"""
     Découpe le document en nœuds alternant titres et blocs de contenu :
       {"type": "heading", "level": int, "text": str}
       {"type": "content", "text": str}
+    Seules les lignes commençant par « # » sont examinées : elles sont
+    localisées par str.find, puis le contenu est découpé par tranches entre
+    les titres, sans boucle Python sur chaque ligne du document.
+
+    Chaque bloc garde le saut de ligne qui termine le titre précédent et celui
+    qui précède le titre suivant : python-markdown ne vide une ligne d'espaces
+    que si elle suit un « \n », sinon elle avale la liste ou le tableau suivant.
+
+      >>> parse_sections("# h\n \n- a\n- b\n")[1]["text"]
+      '\n \n- a\n- b\n'
     """
     nodes = []
-    heading_pattern = re.compile(r"^(#{1,6})\s+(.+)$", re.MULTILINE)
-
-    last_pos = 0
-    for match in heading_pattern.finditer(content):
-        before = content[last_pos:match.start()]
-        if before.strip():
-            nodes.append({"type": "content", "text": before})
-        level = len(match.group(1))
-        text = match.group(2).strip()
-        nodes.append({"type": "heading", "level": level, "text": text})
-        last_pos = match.end()
-
-    remainder = content[last_pos:]
-    if remainder.strip():
-        nodes.append({"type": "content", "text": remainder})
+
+    def add_content(text: str):
+        if text.strip():
+            nodes.append({"type": "content", "text": text})
+
+    def next_candidate(pos: int) -> int:
+        found = content.find("\n#", pos)
+        return found + 1 if found != -1 else -1
+
+    content_start = 0
+    line_start = 0 if content.startswith("#") else next_candidate(0)
+    while line_start != -1:
+        line_end = content.find("\n", line_start)
+        if line_end == -1:
+            line_end = len(content)
+        heading = _heading(content[line_start:line_end])
+        if heading is not None:
+            add_content(content[content_start:line_start])
+            level, text = heading
+            nodes.append({"type": "heading", "level": level, "text": text})
+            content_start = line_end
+        line_start = next_candidate(line_end)
+    add_content(content[content_start:])
 
     return nodes
 
@@ -111,89 +172,113 @@ def parse_sections(content: str) -> list:
 # CONVERSION MARKDOWN → HTML
 # ════════════════════════════════════════════════════════════════════════════
 
+# Instance unique, créée une seule fois : le chargement des extensions et la
+# compilation de leurs regex coûtent cher, on les réutilise pour chaque bloc.
+_MD_EXTENSIONS = ["fenced_code", "tables", "nl2br"]
+try:
+    _MD = markdown.Markdown(extensions=_MD_EXTENSIONS + ["attr_list"], output_format="html")
+except Exception:
+    _MD = markdown.Markdown(extensions=_MD_EXTENSIONS, output_format="html")
+
+
 def md_to_html(text: str) -> str:
     """Convertit un bloc Markdown en HTML via python-markdown."""
     if not text.strip():
         return ""
-    extensions = ["fenced_code", "tables", "nl2br"]
-    try:
-        md = markdown.Markdown(extensions=extensions + ["attr_list"], output_format="html")
-    except Exception:
-        md = markdown.Markdown(extensions=extensions, output_format="html")
-    return md.convert(text)
+    # reset() vide l'état laissé par la conversion précédente (références, etc.)
+    _MD.reset()
+    return _MD.convert(text)
 
 
 # ════════════════════════════════════════════════════════════════════════════
 # CONSTRUCTION HTML AVEC DETAILS IMBRIQUÉS
 # ════════════════════════════════════════════════════════════════════════════
 
+# Début de chaque ligne non vide (indentation du HTML produit par markdown)
+_PAD_LINESTART = re.compile(r"^(?=[^\S\n]*\S)", re.MULTILINE)
+# Lignes composées uniquement d'espaces, ramenées à des lignes vides
+_BLANK_LINE = re.compile(r"^[^\S\n]+$", re.MULTILINE)
+
+# Échappement HTML en une seule passe (texte des titres, titre de page)
+_HTML_ESCAPE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"})
+
+
 class HtmlBuilder:
     """
     Construit le corps HTML du document.
     Gère l'imbrication des <details> via une pile (stack).
+    Les lignes sont accumulées directement en UTF-8 dans un bytearray.
     """
 
     def __init__(self, collapsible_levels: list, open_by_default: list):
         self.collapsible_levels = collapsible_levels
         self.open_by_default = open_by_default
-        self.lines = []
+        self.buf = bytearray()
         self.stack = []
+        # Indentations déjà calculées, indexées par profondeur
+        self._pads = [""]
+
+    def _emit(self, text: str):
+        self.buf += text.encode("utf-8")
+        self.buf += b"\n"
 
     def _close_until(self, level: int):
         while self.stack and self.stack[-1] >= level:
-            self.lines.append("</details>")
+            self._emit("</details>")
             self.stack.pop()
 
     def _pad(self, extra: int = 0) -> str:
-        return "  " * (len(self.stack) + extra)
+        depth = len(self.stack) + extra
+        pads = self._pads
+        while len(pads) <= depth:
+            pads.append(pads[-1] + "  ")
+        return pads[depth]
 
     def add_heading(self, level: int, text: str):
         self._close_until(level)
         pad = self._pad()
+        text = text.translate(_HTML_ESCAPE)
         if level in self.collapsible_levels:
             open_attr = " open" if level in self.open_by_default else ""
-            self.lines.append(f'{pad}<details class="niveau{level}"{open_attr}>')
-            self.lines.append(f'{pad}  <summary class="summary-h{level}">{text}</summary>')
+            self._emit(f'{pad}<details class="niveau{level}"{open_attr}>\n'
+                       f'{pad}  <summary class="summary-h{level}">{text}</summary>')
             self.stack.append(level)
         else:
-            self.lines.append(f'{pad}<h{level}>{text}</h{level}>')
+            self._emit(f'{pad}<h{level}>{text}</h{level}>')
 
     def add_content(self, text: str):
         html = md_to_html(text)
         if not html:
             return
         pad = self._pad(extra=1)
-        for line in html.splitlines():
-            self.lines.append(pad + line if line.strip() else "")
+        self._emit(_PAD_LINESTART.sub(pad, _BLANK_LINE.sub("", html)))
 
     def close_all(self):
         while self.stack:
-            self.lines.append("</details>")
+            self._emit("</details>")
             self.stack.pop()
 
-    def get_html(self) -> str:
-        return "\n".join(self.lines)
+    def write_to(self, fd: int):
+        """
+        Écrit le corps sur un descripteur de fichier, sans copie intermédiaire
+        ni le saut de ligne qui suit la dernière ligne.
+        """
+        _write_all(fd, memoryview(self.buf)[:-1])
 
 
 # ════════════════════════════════════════════════════════════════════════════
 # TEMPLATE HTML COMPLET
 # ════════════════════════════════════════════════════════════════════════════
 
-def build_page(page_title: str, body_html: str, css_file: str, lang: str) -> str:
-    """
-    Assemble la page HTML complète.
-    - Barre sticky en haut : boutons + titre de page
-    - Le titre de page reste visible au scroll
-    - Le H1 du document s'affiche dans le corps (sous la barre)
-    - Fond de page et couleur du titre définis dans le CSS
-    """
-    return f"""<!DOCTYPE html>
-<html lang="{lang}">
+# Gabarit analysé une seule fois à l'import. La page est écrite en trois temps :
+# en-tête (rempli par substitute()), corps produit par HtmlBuilder, pied fixe.
+_PAGE_HEADER_TEMPLATE = Template("""<!DOCTYPE html>
+<html lang="$lang">
 <head>
   <meta charset="UTF-8">
   <meta name="viewport" content="width=device-width, initial-scale=1.0">
-  <title>{page_title}</title>
-  <link rel="stylesheet" href="{css_file}">
+  <title>$page_title</title>
+  <link rel="stylesheet" href="$css_file">
 </head>
 <body>
 
@@ -203,7 +288,7 @@ def build_page(page_title: str, body_html: str, css_file: str, lang: str) -> str
       <a href="index.html" class="btn-toggle">← Index</a>
       <button class="btn-toggle" id="btn-toggle-all">⊞ Replier / Déplier tout</button>
     </div>
-    <div class="topbar-title">{page_title}</div>
+    <div class="topbar-title">$page_title</div>
   </div>
 
   <!-- Espace pour compenser la hauteur de la barre fixe -->
@@ -211,41 +296,72 @@ def build_page(page_title: str, body_html: str, css_file: str, lang: str) -> str
 
   <!-- Corps du document -->
   <div class="page-content">
-{body_html}
+""")
+
+_PAGE_FOOTER = """
   </div>
 
   <script>
-    (function () {{
+    (function () {
       var btn = document.getElementById('btn-toggle-all');
-      btn.addEventListener('click', function () {{
+      btn.addEventListener('click', function () {
         var all = Array.from(document.querySelectorAll('details'));
-        var anyOpen = all.some(function (d) {{ return d.open; }});
-        all.forEach(function (d) {{ d.open = !anyOpen; }});
-      }});
-    }})();
+        var anyOpen = all.some(function (d) { return d.open; });
+        all.forEach(function (d) { d.open = !anyOpen; });
+      });
+    })();
   </script>
 
 </body>
 </html>
-"""
+""".encode("utf-8")
+
+
+def build_page_header(page_title: str, css_file: str, lang: str) -> bytes:
+    """
+    Assemble l'en-tête de la page HTML, jusqu'à l'ouverture du corps.
+    - Barre sticky en haut : boutons + titre de page
+    - Le titre de page reste visible au scroll
+    - Le H1 du document s'affiche dans le corps (sous la barre)
+    - Fond de page et couleur du titre définis dans le CSS
+    """
+    return _PAGE_HEADER_TEMPLATE.substitute(
+        page_title=page_title.translate(_HTML_ESCAPE),
+        css_file=str(css_file).translate(_HTML_ESCAPE),
+        lang=str(lang).translate(_HTML_ESCAPE),
+    ).encode("utf-8")
 
 
 # ════════════════════════════════════════════════════════════════════════════
 # CONVERSION D'UN FICHIER
 # ════════════════════════════════════════════════════════════════════════════
 
+# O_BINARY n'existe que sous Windows, où il évite la traduction des fins de ligne
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+
+def _write_all(fd: int, data):
+    """Écrit les octets directement sur le descripteur, sans couche de tampon."""
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
 def convert(input_path: str, config: dict, output_dir: str = None) -> Path:
     input_file = Path(input_path)
     if not input_file.exists():
         print(f"[erreur] Fichier introuvable : '{input_path}'")
         return None
 
-    # Lecture
-    content = input_file.read_text(encoding="utf-8")
-    print(f"[lecture] {input_file.name} ({len(content)} caractères)")
+    # Lecture des octets bruts, BOM éventuel retiré
+    data = input_file.read_bytes()
+    if data.startswith(b"\xef\xbb\xbf"):
+        data = data[3:]
+    print(f"[lecture] {input_file.name} ({len(data)} octets)")
 
-    # Suppression silencieuse du frontmatter
-    body = strip_frontmatter(content)
+    # Suppression silencieuse du frontmatter, puis décodage du corps seul
+    body = strip_frontmatter(data).decode("utf-8")
 
     # Titre de la page = nom du fichier (sans extension), tirets/underscores → espaces
     page_title = input_file.stem.replace("-", " ").replace("_", " ")
@@ -267,14 +383,6 @@ def convert(input_path: str, config: dict, output_dir: str = None) -> Path:
             builder.add_content(node["text"])
     builder.close_all()
 
-    # Assemblage
-    page_html = build_page(
-        page_title=page_title,
-        body_html=builder.get_html(),
-        css_file=config["css_file"],
-        lang=config["lang"]
-    )
-
     # Écriture
     if output_dir:
         out_dir = Path(output_dir)
@@ -282,16 +390,53 @@ def convert(input_path: str, config: dict, output_dir: str = None) -> Path:
     else:
         out_dir = input_file.parent
 
+    # En-tête préparé avant d'ouvrir (et donc de tronquer) le fichier de sortie :
+    # une erreur à ce stade laisse intacte la page produite précédemment
+    header = build_page_header(
+        page_title=page_title,
+        css_file=config["css_file"],
+        lang=config["lang"]
+    )
+
+    # En-tête, corps et pied écrits à la suite, sans assembler la page en mémoire
     output_file = out_dir / (input_file.stem + ".html")
-    output_file.write_text(page_html, encoding="utf-8")
+    fd = os.open(output_file, _WRITE_FLAGS, 0o644)
+    try:
+        _write_all(fd, header)
+        builder.write_to(fd)
+        _write_all(fd, _PAGE_FOOTER)
+    finally:
+        os.close(fd)
     print(f"[sortie]  → {output_file}")
     return output_file
 
 
+def _convert_one(input_path: str, config: dict, output_dir: str = None) -> tuple:
+    """
+    Convertit un fichier dans un processus de travail.
+    Les messages sont capturés et renvoyés avec le résultat, pour être affichés
+    dans l'ordre des fichiers plutôt qu'entremêlés. Une exception est renvoyée
+    sous forme de traceback, sans perdre les messages déjà produits ni arrêter
+    la conversion des autres fichiers.
+    """
+    log = io.StringIO()
+    result, error = None, None
+    with contextlib.redirect_stdout(log):
+        try:
+            result = convert(input_path, config, output_dir)
+        except Exception:
+            error = traceback.format_exc()
+    return result, log.getvalue(), error
+
+
 # ════════════════════════════════════════════════════════════════════════════
 # POINT D'ENTRÉE
 # ════════════════════════════════════════════════════════════════════════════
 
+# Caractères spéciaux de glob : sans eux, un argument est un chemin littéral
+_GLOB_META = re.compile(r"[*?\[]")
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description="Convertit un ou plusieurs fichiers Markdown Obsidian en HTML statique.",
@@ -315,20 +460,47 @@ Exemples :
     )
     args = parser.parse_args()
 
+    # Lue une seule fois ici, puis transmise telle quelle aux processus de travail
     cfg = load_config(args.config)
 
-    converted = 0
+    paths = []
     for pattern in args.inputs:
-        # Expansion manuelle au cas où le shell ne l'aurait pas fait (Windows, quotes)
-        matches = glob.glob(pattern)
+        # Expansion manuelle au cas où le shell ne l'aurait pas fait (Windows, quotes).
+        # Un chemin littéral (cas de *.md déjà expansé) est pris tel quel.
+        matches = glob.glob(pattern) if _GLOB_META.search(pattern) else []
         if not matches:
             matches = [pattern]  # on tente quand même, convert() gérera l'erreur
         for filepath in sorted(matches):
             if Path(filepath).suffix.lower() == ".md":
-                result = convert(filepath, cfg, args.output)
-                if result:
-                    converted += 1
+                paths.append(filepath)
             else:
                 print(f"[ignoré]  {filepath} (pas un fichier .md)")
 
+    # Fichiers indépendants : conversion en parallèle, un processus par cœur.
+    # Lecture et écriture se font dans chaque processus, si bien que les E/S
+    # d'un fichier se recouvrent avec le parsing des autres.
+    # Repli en série si la plateforme ne permet pas de pool de processus.
+    executor = None
+    if len(paths) > 1:
+        try:
+            executor = ProcessPoolExecutor(max_workers=min(len(paths), os.cpu_count() or 1))
+        except (ImportError, NotImplementedError, OSError):
+            executor = None
+
+    converted = 0
+    failed = 0
+    with executor or contextlib.nullcontext():
+        run = executor.map if executor else map
+        # Affichage au fil de l'eau : les messages déjà reçus sont toujours écrits
+        for result, log, error in run(_convert_one, paths, repeat(cfg), repeat(args.output)):
+            print(log, end="", flush=True)
+            if error:
+                failed += 1
+                print(error, end="", file=sys.stderr, flush=True)
+            elif result:
+                converted += 1
+
     print(f"\n✓ {converted} fichier(s) converti(s).")
+    if failed:
+        print(f"✗ {failed} fichier(s) en erreur.")
+        sys.exit(1)
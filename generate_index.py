@@ -7,29 +7,36 @@ Usage : python generate_index.py
 """
 
 import argparse
+import os
 from pathlib import Path
 
+# Nom affiché : tirets/underscores → espaces, en une seule passe
+_TITLE_TABLE = str.maketrans({"-": " ", "_": " "})
+
 
 def generate_index(search_dir: str, css_file: str, lang: str = "fr"):
     directory = Path(search_dir)
 
     # Collecte tous les .html sauf index.html, triés alphabétiquement par nom
-    html_files = sorted([
-        f for f in directory.glob("*.html")
-        if f.name.lower() != "index.html"
-    ])
+    # (os.scandir : un seul parcours du dossier, sans objet Path par entrée)
+    html_files = []
+    if directory.is_dir():
+        with os.scandir(directory) as entries:
+            html_files = [
+                e.name for e in entries
+                if e.name.endswith(".html") and e.name.lower() != "index.html" and e.is_file()
+            ]
+        html_files.sort()
 
     if not html_files:
         print(f"[index] Aucun fichier HTML trouvé dans '{directory}'.")
         return
 
     # Construction de la liste : nom affiché = stem du fichier, tirets/underscores → espaces
-    items = []
-    for f in html_files:
-        display_name = f.stem.replace("-", " ").replace("_", " ")
-        items.append(f'    <li><a href="{f.name}">{display_name}</a></li>')
-
-    items_html = "\n".join(items)
+    items_html = "\n".join(
+        f'    <li><a href="{name}">{name[:-5].translate(_TITLE_TABLE)}</a></li>'
+        for name in html_files
+    )
 
     page = f"""<!DOCTYPE html>
 <html lang="{lang}">